@@ -0,0 +1,81 @@
+"""initial schema
+
+Matches the tables that Base.metadata.create_all built before migrations were
+introduced, so existing databases can be stamped at this revision.
+
+Revision ID: 0001_initial_schema
+Revises:
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+
+revision = '0001_initial_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('username', sa.String()),
+        sa.Column('email', sa.String()),
+        sa.Column('password', sa.String()),
+        sa.Column('first_name', sa.String(), nullable=True),
+        sa.Column('last_name', sa.String(), nullable=True),
+    )
+    op.create_index('ix_users_id', 'users', ['id'])
+    op.create_index('ix_users_username', 'users', ['username'], unique=True)
+    op.create_index('ix_users_email', 'users', ['email'], unique=True)
+
+    op.create_table(
+        'books',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('author', sa.String(), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+    )
+    op.create_index('ix_books_id', 'books', ['id'])
+    op.create_index('ix_books_title', 'books', ['title'])
+    op.create_index('ix_books_author', 'books', ['author'])
+    op.create_index('ix_books_price', 'books', ['price'])
+
+    op.create_table(
+        'posts',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('content', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+    )
+    op.create_index('ix_posts_id', 'posts', ['id'])
+    op.create_index('ix_posts_title', 'posts', ['title'])
+    op.create_index('ix_posts_content', 'posts', ['content'])
+    op.create_index('ix_posts_created_at', 'posts', ['created_at'])
+
+    op.create_table(
+        'profiles',
+        sa.Column('id', UUID(as_uuid=True), primary_key=True),
+        sa.Column('user_id', UUID(as_uuid=True), sa.ForeignKey('users.id'), nullable=False),
+        sa.Column('bio', sa.String(), nullable=True),
+        sa.Column('location', sa.String(), nullable=True),
+        sa.Column('birthdate', sa.DateTime(), nullable=True),
+        sa.Column('image_url', sa.String(), nullable=True),
+    )
+    op.create_index('ix_profiles_id', 'profiles', ['id'])
+    op.create_index('ix_profiles_bio', 'profiles', ['bio'])
+    op.create_index('ix_profiles_location', 'profiles', ['location'])
+    op.create_index('ix_profiles_birthdate', 'profiles', ['birthdate'])
+    op.create_index('ix_profiles_image_url', 'profiles', ['image_url'])
+
+
+def downgrade():
+    op.drop_table('profiles')
+    op.drop_table('posts')
+    op.drop_table('books')
+    op.drop_table('users')
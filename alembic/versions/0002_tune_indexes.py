@@ -0,0 +1,43 @@
+"""tune indexes
+
+Adds the composite posts(user_id, id) index used by the post endpoints and
+drops indexes that no query reads.
+
+Revision ID: 0002_tune_indexes
+Revises: 0001_initial_schema
+Create Date: 2026-10-15 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002_tune_indexes'
+down_revision = '0001_initial_schema'
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns) of indexes that no query uses
+UNUSED_INDEXES = [
+    ('ix_posts_content', 'posts', ['content']),
+    ('ix_books_author', 'books', ['author']),
+    ('ix_books_title', 'books', ['title']),
+    ('ix_books_price', 'books', ['price']),
+    ('ix_posts_title', 'posts', ['title']),
+    ('ix_posts_created_at', 'posts', ['created_at']),
+    # duplicates of the primary-key indexes
+    ('ix_books_id', 'books', ['id']),
+    ('ix_posts_id', 'posts', ['id']),
+]
+
+
+def upgrade():
+    op.create_index('ix_posts_user_id_id', 'posts', ['user_id', 'id'])
+    for name, table, _ in UNUSED_INDEXES:
+        op.drop_index(name, table_name=table)
+
+
+def downgrade():
+    for name, table, columns in UNUSED_INDEXES:
+        op.create_index(name, table, columns)
+    op.drop_index('ix_posts_user_id_id', table_name='posts')
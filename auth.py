@@ -1,4 +1,9 @@
 import secrets
+import base64
+import calendar
+import hashlib
+import hmac
+import json
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
@@ -11,10 +16,17 @@ SECRET_KEY = os.environ.get('SECRET_KEY')
 ALGORITHM = os.environ.get('ALGORITHM')
 ACCESS_TOKEN_EXPIRE_HOUR = os.environ.get('ACCESS_TOKEN_EXPIRE_HOUR')
 REFRESH_TOKEN_EXPIRE_HOUR = os.environ.get('REFRESH_TOKEN_EXPIRE_HOUR')
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# argon2 for new hashes; existing bcrypt hashes still verify and are upgraded on login
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__time_cost=2,
+    argon2__memory_cost=65536,
+    argon2__parallelism=1,
+)
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+def verify_and_update_password(plain_password, hashed_password):
+    return pwd_context.verify_and_update(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
@@ -25,7 +37,7 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOUR)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -35,10 +47,46 @@ def create_refresh_token(data: dict, expires_delta: timedelta = None):
         expire = datetime.utcnow() + expires_delta
     else:
         expire = datetime.utcnow() + timedelta(hours=REFRESH_TOKEN_EXPIRE_HOUR)
-    to_encode.update({"exp": expire})
+    to_encode.update({"exp": expire, "iat": datetime.utcnow()})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+# The header only depends on ALGORITHM, so it is encoded once at import
+_JWT_HEADER = _b64url(json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode())
+
+def create_token_pair(data: dict, access_ttl: timedelta, refresh_ttl: timedelta):
+    """Sign an access and a refresh token for the same claims.
+
+    The shared claims are JSON-encoded once and only the ``exp`` claim differs
+    between the two tokens; both are signed from a single keyed HMAC object.
+    """
+    if "exp" in data:
+        # The body is spliced as '<claims>,"exp":...}', so an existing exp would be duplicated
+        raise ValueError("data must not contain an 'exp' claim")
+    digest = _HMAC_DIGESTS.get(ALGORITHM)
+    if digest is None:
+        return create_access_token(data, access_ttl), create_refresh_token(data, refresh_ttl)
+
+    now = datetime.utcnow()
+    claims = dict(data, iat=calendar.timegm(now.utctimetuple()))
+    # Drop the closing brace so each token can append its own exp claim
+    body = json.dumps(claims, separators=(",", ":"))[:-1]
+    signer = hmac.new(SECRET_KEY.encode(), digestmod=digest)
+
+    tokens = []
+    for ttl in (access_ttl, refresh_ttl):
+        expire = calendar.timegm((now + ttl).utctimetuple())
+        signing_input = _JWT_HEADER + b"." + _b64url(f'{body},"exp":{expire}}}'.encode())
+        mac = signer.copy()
+        mac.update(signing_input)
+        tokens.append((signing_input + b"." + _b64url(mac.digest())).decode())
+    return tokens[0], tokens[1]
+
 def decode_token(token: str):
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -1,7 +1,5 @@
-
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
 
@@ -11,17 +9,29 @@ DB_PASSWORD = os.environ.get('DB_PASSWORD')
 DB_USER = os.environ.get('DB_USER')
 DB_HOST = os.environ.get('DB_HOST')
 DB_PORT = os.environ.get('DB_PORT')
+# Set to 0 when running behind PgBouncer in transaction pooling mode
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 500))
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
+DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}?prepared_statement_cache_size={DB_STATEMENT_CACHE_SIZE}"
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=int(os.environ.get('DB_POOL_SIZE', 20)),
+    max_overflow=int(os.environ.get('DB_MAX_OVERFLOW', 20)),
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    connect_args={"statement_cache_size": DB_STATEMENT_CACHE_SIZE},
+)
+SessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 # cqlsys
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with SessionLocal() as db:
         yield db
-    finally:
-        db.close()
+
+async def get_unmanaged_db():
+    # Plain (non-yield) dependency: the route owns the session and must close it.
+    # Used where the session has to outlive dependency teardown, e.g. streaming.
+    return SessionLocal()
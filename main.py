@@ -1,20 +1,30 @@
 import logging
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from database import engine
 from schemas import *
 from models import *
 from auth import *
 from middleware import AuthMiddleware
-from fastapi.security import HTTPBearer
 from sqlalchemy.dialects.postgresql import UUID
 from routes import user, posts, books, profile
 
 logger = logging.getLogger("uvicorn")
 
-Base.metadata.create_all(bind=engine)
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The schema is managed by `alembic upgrade head` (see README). create_all is
+    # opt-in so every worker boot doesn't introspect the database.
+    if os.environ.get("RUN_SCHEMA_CREATE") == "1":
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    yield
+    await engine.dispose()
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.add_middleware(AuthMiddleware)
-security = HTTPBearer()
 
 app.include_router(user.router, prefix="/users", tags=["Users"])
 app.include_router(posts.router, prefix="/posts", tags=["BlogPosts"])
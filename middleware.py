@@ -1,40 +1,64 @@
-from fastapi import Request, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import status
 from jose import jwt, JWTError
 from auth import SECRET_KEY, ALGORITHM
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from cachetools import TTLCache
+import hashlib
 import logging
+import threading
+import time
 
 logger = logging.getLogger("uvicorn")
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        logger.debug(f"AuthMiddleware triggered for path: {request.url.path}")
-        
-        public_routes = ["/", "/users/login/", "/users/register/", "/docs", "/redoc", "/openapi.json","/favicon.ico"]
-        if request.url.path in public_routes or any(request.url.path.startswith(route) for route in public_routes[1:]):
-            logger.debug(f"Middleware bypassed for path: {request.url.path}")
-            return await call_next(request)
-        
-        auth_header = request.headers.get("Authorization")
-        # logger.debug(f"Authentication header-----> {auth_header}")
+# Verified JWT payloads keyed by SHA-256 of the token, so repeated requests
+# with the same token skip signature verification for a few seconds.
+_jwt_cache = TTLCache(maxsize=10000, ttl=5)
+_jwt_cache_lock = threading.Lock()
+
+# Routes that skip authentication, matched once per request with a single
+# set lookup and one C-level str.startswith over the prefix tuple.
+_PUBLIC_EXACT = frozenset({"/"})
+_PUBLIC_PREFIXES = ("/users/login/", "/users/register/", "/docs", "/redoc", "/openapi.json", "/favicon.ico")
+
+class AuthMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        path = scope["path"]
+        if path in _PUBLIC_EXACT or path.startswith(_PUBLIC_PREFIXES):
+            return await self.app(scope, receive, send)
+
+        auth_header = Headers(scope=scope).get("Authorization")
         if not auth_header or not auth_header.startswith("Bearer "):
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 content={"detail": "Authorization header missing or invalid"}
             )
-        
+            return await response(scope, receive, send)
+
         token = auth_header.split(" ")[1]
-        try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-            # logger.info(f"Decoded JWT payload: {payload}")
-            request.state.user = payload
-        except JWTError as e:
-            logger.error(f"JWT decoding failed: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                content={"detail": "Invalid or expired token"}
-            )
+        key = hashlib.sha256(token.encode()).digest()
+        with _jwt_cache_lock:
+            payload = _jwt_cache.get(key)
+        if payload is None or payload.get("exp", 0) <= time.time():
+            try:
+                payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            except JWTError as e:
+                logger.error("JWT decoding failed: %s", e)
+                response = JSONResponse(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    content={"detail": "Invalid or expired token"}
+                )
+                return await response(scope, receive, send)
+
+            with _jwt_cache_lock:
+                _jwt_cache[key] = payload
 
-        return await call_next(request)
\ No newline at end of file
+        # request.state is backed by scope["state"]
+        scope.setdefault("state", {})["user"] = payload
+        await self.app(scope, receive, send)
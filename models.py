@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from database import Base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -22,21 +22,23 @@ class User(Base):
 class Book(Base):
     __tablename__ = 'books'
 
-    id= Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    title = Column(String, nullable=False, index=True)
-    author = Column(String, nullable=True, index=True)
-    price = Column(Float, nullable=False, index=True)
+    id= Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title = Column(String, nullable=False)
+    author = Column(String, nullable=True)
+    price = Column(Float, nullable=False)
 
 class Post(Base):
     __tablename__ = "posts"
-    id= Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
-    title = Column(String, nullable=False, index=True)
-    content = Column(String, nullable=True, index=True)
-    created_at = Column(DateTime, nullable=False, index=True, default=datetime.datetime.now)
+    id= Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    title = Column(String, nullable=False)
+    content = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.now)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     author = relationship("User", back_populates="posts")
 
+    __table_args__ = (Index("ix_posts_user_id_id", "user_id", "id"),)
+
 class Profile(Base):
     __tablename__ = 'profiles'
     id= Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
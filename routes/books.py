@@ -1,74 +1,96 @@
 import logging
+import uuid
+import orjson
 from fastapi import Depends, HTTPException,Request,APIRouter
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from database import get_db
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_db, get_unmanaged_db
 from schemas import *
 from models import *
 from auth import *
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 logger = logging.getLogger("uvicorn")
 router = APIRouter()
-security = HTTPBearer()
 
 @router.get('/')
-async def get_books(request:Request,credentials: HTTPAuthorizationCredentials = Depends(security), db: Session=Depends(get_db)):
-    db_books = db.query(Book).all()
-    return JSONResponse({'data': [{'id': str(book.id), 'title': book.title, 'author': book.author, 'price': book.price} for book in db_books], 'status': True},status_code=200)
+async def get_books(db: AsyncSession = Depends(get_unmanaged_db)):
+    # The books table is unbounded, so rows are streamed in batches of 500 rather
+    # than built into one JSON document. get_db's session is closed before the
+    # body is sent, so this route owns its session and closes it itself.
+    try:
+        # Start the query before returning so database errors still produce a 500
+        result = await db.stream(
+            select(Book.id, Book.title, Book.author, Book.price).execution_options(yield_per=500)
+        )
+    except Exception:
+        await db.close()
+        raise
+
+    async def stream_books():
+        try:
+            yield b'{"data":['
+            separator = b''
+            async for book in result:
+                yield separator + orjson.dumps({'id': str(book.id), 'title': book.title, 'author': book.author, 'price': book.price})
+                separator = b','
+            yield b'],"status":true}'
+        finally:
+            await db.close()
+
+    # The background close also covers a client that disconnects before the generator starts
+    return StreamingResponse(stream_books(), media_type="application/json", background=BackgroundTask(db.close))
 
 @router.post('/')
-async def add_book(book: BookCreate,credentials: HTTPAuthorizationCredentials = Depends(security), db: Session=Depends(get_db)):
-    logger.info(f"Adding book--> {book}")
+async def add_book(book: BookCreate, db: AsyncSession=Depends(get_db)):
+    logger.debug("Adding book--> %s", book)
     new_book = Book(
         title=book.title,
         author=book.author,
         price=book.price
     )
     db.add(new_book)
-    db.commit()
-    db.refresh(new_book)
+    await db.commit()
     return new_book
 
 @router.get('/{id}/')
-async def get_book(id: str, credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-        db_book = db.query(Book).filter(Book.id == id).first()
+async def get_book(id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+        db_book = await db.get(Book, id)
         if db_book is None:
             raise HTTPException(status_code=404, detail="Book not found")
         return db_book
 
 @router.put('/{id}/')
-async def put_book(id:str,book: BookCreate,credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    db_book = db.query(Book).filter(Book.id == id).first()
+async def put_book(id: uuid.UUID,book: BookCreate, db: AsyncSession = Depends(get_db)):
+    db_book = await db.get(Book, id)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
     db_book.title = book.title
     db_book.author = book.author
     db_book.price = book.price
-    db.commit()
-    db.refresh(db_book)
+    await db.commit()
+    await db.refresh(db_book)
     return db_book
 
 @router.patch('/{id}/')
-async def patch_book(id:str,book:BookUpdate,credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    db_book = db.query(Book).filter(Book.id == id).first()
+async def patch_book(id: uuid.UUID,book:BookUpdate, db: AsyncSession = Depends(get_db)):
+    update_data = book.dict(exclude_unset=True, exclude_none=True)
+    if update_data:
+        # Single round trip: UPDATE ... RETURNING instead of SELECT then UPDATE
+        db_book = (await db.execute(update(Book).where(Book.id == id).values(**update_data).returning(Book))).scalar_one_or_none()
+        await db.commit()
+    else:
+        db_book = await db.get(Book, id)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
-    if book.title:
-        db_book.title = book.title
-    if book.author:
-        db_book.author = book.author
-    if book.price:
-        db_book.price = book.price
-    db.commit()
-    db.refresh(db_book)
     return db_book
 
 @router.delete('/{id}/')
-async def delete_book(id:str,credentials: HTTPAuthorizationCredentials = Depends(security), db: Session = Depends(get_db)):
-    db_book = db.query(Book).filter(Book.id == id).first()
+async def delete_book(id: uuid.UUID, db: AsyncSession = Depends(get_db)):
+    db_book = await db.get(Book, id)
     if db_book is None:
         raise HTTPException(status_code=404, detail="Book not found")
-    db.delete(db_book)
-    db.commit()
-    return JSONResponse({'status':True, "message": "Book deleted successfully"}, status_code=200)
\ No newline at end of file
+    await db.delete(db_book)
+    await db.commit()
+    return {'status':True, "message": "Book deleted successfully"}
\ No newline at end of file
